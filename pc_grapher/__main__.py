@@ -10,12 +10,17 @@ When the program is run, this module is executed first.
 try:
     from gui import AppGUI
     from graphing import Grapher
+    import analysis
     import data_components
 except ImportError:
     from .gui import AppGUI
     from .graphing import Grapher
+    from . import analysis
     from . import data_components
 
+# The raw data is drawn as the min/max of this many points, about two per pixel of the graph
+RAW_PLOT_POINTS: int = 4000
+
 
 class Application:
     """
@@ -31,6 +36,7 @@ class Application:
         data_components.check_folder_exists()  # Check if the application folder is set up correctly
 
         self.__current_data = None
+        self.__analysis_cache = analysis.AnalysisCache()
         self.__grapher = Grapher()
         self.__gui = AppGUI(main_app=self, grapher=self.__grapher)
         self.__gui.protocol("WM_DELETE_WINDOW", self.__shutdown)
@@ -44,6 +50,7 @@ class Application:
         :return:None
         """
 
+        self.__analysis_cache.shutdown()
         self.__gui.quit()
         self.__gui.destroy()
 
@@ -57,13 +64,91 @@ class Application:
         """
 
         self.__current_data = data_components.GraphData(file_name)
-        data = self.__current_data.get_data()
+        values = self.__current_data.get_value_array()
+
+        # Queue the spectrum before drawing so the worker runs while the raw data is plotted
+        spectral_future = self.__analysis_cache.request_spectral(self.__current_data)
+
+        # There is no zooming, so the min/max of each pixel wide bucket looks the same as all
+        # the points while being much faster to draw
+        indices, plot_values = analysis.decimate_min_max(values, RAW_PLOT_POINTS)
         self.__grapher.clear()
         self.__grapher.set_value_label(self.__current_data.get_value_type())
-        self.__grapher.plot(data[0], data[1], 'r')
+        self.__grapher.plot(indices * self.__current_data.get_sample_interval(), plot_values, 'r')
         self.__gui.update_graph()
         self.__gui.top_menu.update_text_info_box(self.__current_data)
 
+        # The analysis panes are calculated on a worker, so poll until each is ready. The
+        # rolling statistics are only queued once the spectrum is done so they don't slow it
+        self.__poll_analysis(self.__current_data, spectral_future, self.__plot_spectral,
+                             self.__grapher.show_spectral_error, self.__request_rolling)
+
+    def __request_rolling(self, file_data: data_components.GraphData) -> None:
+        """
+        Queues the rolling statistics for a file and plots them once they are ready.
+
+        :param file_data: The data to calculate the rolling statistics for.
+        :return: None
+        """
+
+        future = self.__analysis_cache.request_rolling(file_data)
+        self.__poll_analysis(file_data, future, self.__plot_rolling,
+                             self.__grapher.show_rolling_error)
+
+    def __poll_analysis(self, file_data: data_components.GraphData, future, on_finished,
+                        on_failed, then=None) -> None:
+        """
+        Checks if some analysis for a file has finished and if so plots it.
+
+        :param file_data: The data the analysis was requested for.
+        :param future: The future which will hold the analysis.
+        :param on_finished: The function which plots the finished analysis.
+        :param on_failed: The function which shows the error message if the analysis failed.
+        :param then: An optional function called with the file data once the analysis is done.
+        :return: None
+        """
+
+        if file_data is not self.__current_data:  # a different file has been selected since
+            return
+
+        if not future.done():
+            self.__gui.after(50, self.__poll_analysis, file_data, future, on_finished,
+                             on_failed, then)
+            return
+
+        if future.cancelled():  # only happens when the app is shutting down
+            return
+
+        if future.exception() is not None:
+            on_failed(str(future.exception()) or type(future.exception()).__name__)
+        else:
+            on_finished(future.result())
+        self.__gui.update_graph(force=True)
+
+        if then is not None:
+            then(file_data)
+
+    def __plot_spectral(self, spectral: analysis.SpectralAnalysis) -> None:
+        """
+        Plots the spectrum and spectrogram panes.
+
+        :param spectral: The finished spectral analysis.
+        :return: None
+        """
+
+        self.__grapher.plot_spectrum(*spectral.get_spectrum())
+        self.__grapher.plot_spectrogram(*spectral.get_spectrogram())
+
+    def __plot_rolling(self, rolling: analysis.RollingAnalysis) -> None:
+        """
+        Plots the rolling statistics pane.
+
+        :param rolling: The finished rolling analysis.
+        :return: None
+        """
+
+        self.__grapher.plot_rolling(*rolling.get_rolling())
+
 
 if __name__ == "__main__":
     Application()
@@ -0,0 +1,391 @@
+"""
+This module contains the signal analysis views (rolling statistics, spectrum and spectrogram)
+computed over the graph data.
+"""
+
+# Pylint ignores
+# pylint: disable=E0402
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import numpy as np
+
+try:
+    import data_components
+except ImportError:
+    from . import data_components
+
+# How many FFT segments are transformed at once, this bounds the memory used for large captures
+SEGMENT_CHUNK_SIZE: int = 4096
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Calculates the mean of every full window in O(n) using a cumulative sum.
+
+    :param values: The sample values.
+    :param window: The number of samples in each window.
+    :return: An array of length len(values) - window + 1 with the mean of each window.
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+    window = _check_window(values, window)
+    if window == 0:
+        return np.empty(0)
+
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    return (cumulative[window:] - cumulative[:-window]) / window
+
+
+def rolling_rms(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Calculates the root mean square of every full window in O(n).
+
+    :param values: The sample values.
+    :param window: The number of samples in each window.
+    :return: An array of length len(values) - window + 1 with the RMS of each window.
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+    mean_square = rolling_mean(values * values, window)
+
+    # The cumulative sum can leave tiny negative rounding errors, which sqrt doesn't like
+    return np.sqrt(np.maximum(mean_square, 0.0))
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Calculates the maximum of every full window in O(n) with the van Herk/Gil-Werman algorithm.
+
+    :param values: The sample values.
+    :param window: The number of samples in each window.
+    :return: An array of length len(values) - window + 1 with the maximum of each window.
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+    window = _check_window(values, window)
+    if window == 0:
+        return np.empty(0)
+
+    # Split the data into blocks of the window size, then every window covers the end of one
+    # block (suffix max) and the start of the next (prefix max)
+    blocks = -(-len(values) // window)
+    padded = np.full(blocks * window, -np.inf)
+    padded[:len(values)] = values
+    padded = padded.reshape(blocks, window)
+
+    prefix = np.maximum.accumulate(padded, axis=1).ravel()
+    suffix = np.maximum.accumulate(padded[:, ::-1], axis=1)[:, ::-1].ravel()
+
+    count = len(values) - window + 1
+    return np.maximum(suffix[:count], prefix[window - 1:window - 1 + count])
+
+
+def _check_window(values: np.ndarray, window: int) -> int:
+    """
+    Checks the rolling window size is usable for the data.
+
+    :param values: The sample values.
+    :param window: The number of samples in each window.
+    :return: The window size, or 0 if there isn't enough data for a single window.
+    """
+
+    if window < 1:
+        raise ValueError("The rolling window must contain at least one sample.")
+
+    return window if window <= len(values) else 0
+
+
+def _segment_power(values: np.ndarray, sample_rate: float, segment_length: int,
+                   max_columns: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Transforms the overlapping segments of the data and sums their power into time columns.
+
+    :param values: The sample values.
+    :param sample_rate: The sample rate in Hz.
+    :param segment_length: The number of samples in each FFT segment.
+    :param max_columns: The maximum number of time columns to sum the segments into.
+    :return: A tuple containing the frequencies, column centre times, the summed power spectral
+             density of each column and the number of segments in each column.
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+    segment_length = min(segment_length, len(values))
+    if segment_length < 2:
+        return np.empty(0), np.empty(0), np.empty((0, 0)), np.empty(0)
+
+    hop = max(segment_length // 2, 1)
+    segment_count = (len(values) - segment_length) // hop + 1
+    column_count = min(max_columns, segment_count)
+
+    window = np.hanning(segment_length + 2)[1:-1]  # drop the zero end points
+    scale = 1.0 / (sample_rate * np.sum(window * window))
+    freqs = np.fft.rfftfreq(segment_length, d=1.0 / sample_rate)
+
+    # Every segment is assigned to a column, so each column averages its neighbouring segments
+    segment_columns = np.arange(segment_count) * column_count // segment_count
+    columns = np.zeros((len(freqs), column_count))
+    counts = np.bincount(segment_columns, minlength=column_count).astype(np.float64)
+
+    segments = np.lib.stride_tricks.sliding_window_view(values, segment_length)[::hop]
+    for start in range(0, segment_count, SEGMENT_CHUNK_SIZE):
+        chunk = segments[start:start + SEGMENT_CHUNK_SIZE]
+        # Remove each segment's mean so the steady current doesn't leak into the low bins
+        chunk = (chunk - chunk.mean(axis=1, keepdims=True)) * window
+        power = np.abs(np.fft.rfft(chunk, axis=1)) ** 2
+        # The segments are in column order, so sum each run of segments sharing a column
+        chunk_columns = segment_columns[start:start + SEGMENT_CHUNK_SIZE]
+        run_starts = np.flatnonzero(np.diff(chunk_columns, prepend=-1))
+        columns[:, chunk_columns[run_starts]] += np.add.reduceat(power, run_starts, axis=0).T
+
+    # One sided density, so double everything except the DC and (even length) Nyquist bins
+    columns *= scale
+    last_doubled: int = len(freqs) - 1 if segment_length % 2 == 0 else len(freqs)
+    columns[1:last_doubled] *= 2
+
+    centres = (np.arange(segment_count) * hop + segment_length / 2.0) / sample_rate
+    times = np.bincount(segment_columns, weights=centres, minlength=column_count) / counts
+
+    return freqs, times, columns, counts
+
+
+def decimate_min_max(values: np.ndarray, max_points: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Reduces the data to the minimum and maximum of evenly sized buckets, so a line plot of
+    the result looks the same as the full data while drawing far fewer points.
+
+    :param values: The sample values.
+    :param max_points: The maximum number of points to return.
+    :return: A tuple containing the sample indices and values of the points to plot.
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) <= max_points:
+        return np.arange(len(values)), values
+
+    bucket_size: int = -(-len(values) // max(max_points // 2, 1))
+    buckets = -(-len(values) // bucket_size)
+    padded = np.pad(values, (0, buckets * bucket_size - len(values)), mode='edge')
+    padded = padded.reshape(buckets, bucket_size)
+
+    # Keep each bucket's min and max in the order they happen so the line shape is preserved
+    starts = np.arange(buckets) * bucket_size
+    min_indices = starts + padded.argmin(axis=1)
+    max_indices = starts + padded.argmax(axis=1)
+    indices = np.sort(np.stack((min_indices, max_indices), axis=1), axis=1).ravel()
+    indices = np.minimum(indices, len(values) - 1)
+
+    return indices, values[indices]
+
+
+def _get_sample_interval(graph_data: data_components.GraphData) -> float:
+    """
+    Gets the time between samples, checking the time axis can be calculated from it.
+
+    :param graph_data: The graph data to analyse.
+    :return: The time between samples in seconds.
+    """
+
+    sample_interval: float = graph_data.get_sample_interval()
+    if sample_interval <= 0:
+        raise ValueError("The file's time interval must be more than 0ms to analyse it.")
+
+    return sample_interval
+
+
+def _bucket_reduce(values: np.ndarray, step: int, reduce: np.ufunc) -> np.ndarray:
+    """
+    Reduces every run of step values into a single value.
+
+    :param values: The values to reduce.
+    :param step: The number of values in each run.
+    :param reduce: The ufunc to reduce each run with, eg np.maximum.
+    :return: An array with one value per run.
+    """
+
+    return reduce.reduceat(values, np.arange(0, len(values), step)) if len(values) else values
+
+
+class RollingAnalysis:
+    """
+    This class is responsible for calculating the rolling statistics for a set of graph data,
+    reduced to a fixed number of display points.
+    """
+
+    def __init__(self, graph_data: data_components.GraphData, window_time: float = 1.0,
+                 display_points: int = 2048) -> None:
+        """
+        The constructor calculates the rolling statistics for the data.
+
+        :param graph_data: The graph data to analyse.
+        :param window_time: The length of the rolling window in seconds.
+        :param display_points: The maximum number of points kept for each statistic.
+        :return: None
+        """
+
+        values: np.ndarray = graph_data.get_value_array()
+        sample_interval: float = _get_sample_interval(graph_data)
+
+        # Rolling windows are aligned to the time of their last sample
+        window: int = max(1, min(round(window_time / sample_interval), len(values)))
+        count: int = max(len(values) - window + 1, 0)
+        step: int = max(1, -(-count // display_points))
+
+        # Each display point summarises the step windows ending in its bucket, the full length
+        # statistics are only kept long enough to be reduced
+        bucket_sizes = _bucket_reduce(np.ones(count), step, np.add)
+        self.__time: np.ndarray = (np.arange(0, count, step) + window - 1) * sample_interval
+        self.__mean: np.ndarray = _bucket_reduce(rolling_mean(values, window), step,
+                                                 np.add) / bucket_sizes
+        self.__rms: np.ndarray = _bucket_reduce(rolling_rms(values, window), step,
+                                                np.add) / bucket_sizes
+        self.__max: np.ndarray = _bucket_reduce(rolling_max(values, window), step, np.maximum)
+
+    def get_rolling(self) -> tuple:
+        """
+        Returns the rolling statistics.
+
+        :return: A tuple containing the time, rolling mean, rolling RMS and rolling max data.
+        """
+
+        return self.__time, self.__mean, self.__rms, self.__max
+
+
+class SpectralAnalysis:
+    """
+    This class is responsible for calculating the spectrum and spectrogram for a set of
+    graph data. The spectrum uses Welch's method (Hann window, 50% overlap) and when there are
+    more segments than spectrogram columns, neighbouring segments are averaged into each column.
+    """
+
+    def __init__(self, graph_data: data_components.GraphData, segment_length: int = 1024,
+                 spectrogram_columns: int = 512) -> None:
+        """
+        The constructor calculates the spectrum and spectrogram for the data.
+
+        :param graph_data: The graph data to analyse.
+        :param segment_length: The number of samples in each FFT segment.
+        :param spectrogram_columns: The maximum number of time columns in the spectrogram.
+        :return: None
+        """
+
+        values: np.ndarray = graph_data.get_value_array()
+        sample_rate: float = 1.0 / _get_sample_interval(graph_data)
+
+        # The spectrum is the average of all the spectrogram columns, so only transform once
+        freqs, times, columns, counts = _segment_power(values, sample_rate, segment_length,
+                                                       spectrogram_columns)
+        self.__frequencies: np.ndarray = freqs
+        self.__spectrogram_times: np.ndarray = times
+        self.__spectrogram: np.ndarray = columns / np.maximum(counts, 1)
+        self.__spectrum: np.ndarray = (columns.sum(axis=1) / counts.sum() if len(counts)
+                                       else np.empty(0))
+
+    def get_spectrum(self) -> tuple:
+        """
+        Returns the Welch power spectral density.
+
+        :return: A tuple containing the frequency and power spectral density data.
+        """
+
+        return self.__frequencies, self.__spectrum
+
+    def get_spectrogram(self) -> tuple:
+        """
+        Returns the spectrogram.
+
+        :return: A tuple containing the frequencies, column times and power spectral density
+                 (with shape (frequencies, columns)).
+        """
+
+        return self.__frequencies, self.__spectrogram_times, self.__spectrogram
+
+
+class AnalysisCache:
+    """
+    This class is responsible for calculating the analysis on a worker thread and caching
+    the results for the most recently used files.
+    """
+
+    def __init__(self, max_files: int = 4) -> None:
+        """
+        The constructor creates the worker and the empty cache.
+
+        :param max_files: The number of files to keep the analysis of.
+        :return: None
+        """
+
+        self.__max_files: int = max_files
+        self.__executor = ThreadPoolExecutor(max_workers=1)
+        # Ordered from least to most recently used
+        self.__cache: OrderedDict[str, tuple[float, dict[type, Future]]] = OrderedDict()
+
+    def request_spectral(self, graph_data: data_components.GraphData) -> Future:
+        """
+        Gets the spectral analysis for some graph data, starting it if it isn't cached.
+
+        :param graph_data: The graph data to analyse.
+        :return: A future which will hold the SpectralAnalysis for the data.
+        """
+
+        return self.__request(graph_data, SpectralAnalysis)
+
+    def request_rolling(self, graph_data: data_components.GraphData) -> Future:
+        """
+        Gets the rolling analysis for some graph data, starting it if it isn't cached.
+
+        :param graph_data: The graph data to analyse.
+        :return: A future which will hold the RollingAnalysis for the data.
+        """
+
+        return self.__request(graph_data, RollingAnalysis)
+
+    def __request(self, graph_data: data_components.GraphData, analysis_type: type) -> Future:
+        """
+        Gets an analysis for some graph data, starting it on the worker if it isn't cached.
+
+        :param graph_data: The graph data to analyse.
+        :param analysis_type: The analysis class to create from the graph data.
+        :return: A future which will hold the analysis for the data.
+        """
+
+        file_name: str = graph_data.get_file_name()
+        modified_time: float = graph_data.get_modified_time()
+
+        # Start a new cache entry if the file has changed since it was analysed
+        cached = self.__cache.get(file_name)
+        if cached is None or cached[0] != modified_time:
+            cached = (modified_time, {})
+            self.__cache[file_name] = cached
+        self.__cache.move_to_end(file_name)
+
+        # Reuse the cached analysis unless it failed
+        future = cached[1].get(analysis_type)
+        if future is None or not _is_usable(future):
+            future = self.__executor.submit(analysis_type, graph_data)
+            cached[1][analysis_type] = future
+
+        while len(self.__cache) > self.__max_files:
+            self.__cache.popitem(last=False)
+
+        return future
+
+    def shutdown(self) -> None:
+        """
+        Stops the worker, cancelling any analysis which hasn't started.
+
+        :return: None
+        """
+
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _is_usable(future: Future) -> bool:
+    """
+    Checks if a cached analysis future is still running or finished successfully.
+
+    :param future: The future to check.
+    :return: True if the future can be reused, False otherwise.
+    """
+
+    return not future.done() or (not future.cancelled() and future.exception() is None)
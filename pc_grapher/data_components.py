@@ -4,6 +4,7 @@ This file contains functions and classes to handle and manipulate the graph data
 
 import os
 import appdirs
+import numpy as np
 
 
 class GraphData:
@@ -20,7 +21,10 @@ class GraphData:
 
         self.__time_data: list[float] = []
         self.__value_data: [float | int] = []
+        self.__value_array: np.ndarray | None = None  # created when first needed
         self.__value_type: str = ""  # eg CURRENT, VOLTAGE, etc
+        self.__time_interval: int = 0  # in ms
+        self.__modified_time: float = 0.0  # of the file when it was imported
         self.__file_name: str = file_name
 
         self.__import_data(get_appdata_file_path(file_name))
@@ -38,11 +42,16 @@ class GraphData:
         # Line1: Value 1, Value 2, Value 3, ..., Value n
         # It must also be .txt file
 
+        # Read the modified time first, so if the file is rewritten while it's being read the
+        # data will look out of date rather than the newer file looking already imported
+        self.__modified_time = os.path.getmtime(file_name)
+
         with open(file_name, 'r', encoding='utf-8') as file:
             lines: list[str] = file.readlines()
 
             # Get the time interval
             time_interval: int = int(lines[0].split(',')[1])
+            self.__time_interval = time_interval
             # get the value type
             self.__value_type: str = lines[0].split(',')[0].upper()
 
@@ -60,6 +69,18 @@ class GraphData:
 
         return self.__time_data, self.__value_data
 
+    def get_value_array(self) -> np.ndarray:
+        """
+        Returns the value data as a numpy array, converting it on the first call.
+
+        :return: The value data as a float64 numpy array.
+        """
+
+        if self.__value_array is None:
+            self.__value_array = np.asarray(self.__value_data, dtype=np.float64)
+
+        return self.__value_array
+
     def get_value_type(self) -> str:
         """
         Returns the type of value data.
@@ -69,6 +90,24 @@ class GraphData:
 
         return self.__value_type
 
+    def get_sample_interval(self) -> float:
+        """
+        Returns the time between samples.
+
+        :return: The time between samples in seconds.
+        """
+
+        return self.__time_interval / 1000.0
+
+    def get_modified_time(self) -> float:
+        """
+        Returns the modified time of the file when its data was imported.
+
+        :return: The modified time of the file (as given by os.path.getmtime).
+        """
+
+        return self.__modified_time
+
     def get_file_name(self) -> str:
         """
         Returns the name of the file.
@@ -5,6 +5,7 @@ This module contains functions for graphing data.
 from sys import platform as sys_pf
 from matplotlib import pyplot as plt
 import matplotlib
+import numpy as np
 
 # This fixes the issue with the matplotlib backend on macOS.
 if sys_pf == 'darwin':
@@ -21,9 +22,16 @@ class Grapher:
         Initializes the Grapher object.
         """
 
-        self.__fig, self.__ax = plt.subplots()
+        # The raw data and rolling statistics are on the left, the spectral views on the right
+        self.__fig = plt.figure()
         self.__fig.set_size_inches(11, 6)
-        self.__fig.subplots_adjust(left=0.05, right=0.99, top=0.98, bottom=0.1)
+        grid = self.__fig.add_gridspec(2, 2, width_ratios=[3, 2])
+        self.__ax = self.__fig.add_subplot(grid[0, 0])
+        self.__rolling_ax = self.__fig.add_subplot(grid[1, 0], sharex=self.__ax)
+        self.__spectrum_ax = self.__fig.add_subplot(grid[0, 1])
+        self.__spectrogram_ax = self.__fig.add_subplot(grid[1, 1])
+        self.__fig.subplots_adjust(left=0.05, right=0.99, top=0.98, bottom=0.1,
+                                   wspace=0.15, hspace=0.25)
         self.__ax.set_xlabel("Time (s)")
 
     def get_axis(self) -> plt.Axes:
@@ -53,11 +61,95 @@ class Grapher:
         """
 
         self.__ax.clear()
+        self.clear_analysis()
         # self.__fig.clear()
 
+    def clear_analysis(self) -> None:
+        """
+        Clears the analysis panes.
+        """
+
+        self.__rolling_ax.clear()
+        self.__spectrum_ax.clear()
+        self.__spectrogram_ax.clear()
+
     def set_value_label(self, label: str) -> None:
         """
         Sets the label for the y-axis.
         """
 
         self.__ax.set_ylabel(label)
+
+    def plot_rolling(self, time_data, mean_data, rms_data, max_data) -> None:
+        """
+        Plots the rolling statistics on the rolling pane.
+        """
+
+        self.__rolling_ax.clear()
+        self.__rolling_ax.set_xlabel("Time (s)")
+        self.__rolling_ax.set_ylabel("Rolling " + self.__ax.get_ylabel())
+        self.__rolling_ax.plot(time_data, mean_data, 'b', label="Mean")
+        self.__rolling_ax.plot(time_data, rms_data, 'g', label="RMS")
+        self.__rolling_ax.plot(time_data, max_data, 'r', label="Max")
+        self.__rolling_ax.legend(loc="upper right")
+
+    def plot_spectrum(self, freq_data, power_data) -> None:
+        """
+        Plots the power spectral density on the spectrum pane.
+        """
+
+        self.__spectrum_ax.clear()
+        self.__spectrum_ax.set_xlabel("Frequency (Hz)")
+        self.__spectrum_ax.set_ylabel("PSD")
+
+        # Skip the DC bin as the mean is removed before the spectrum is calculated
+        if len(freq_data) > 1:
+            self.__spectrum_ax.semilogy(freq_data[1:], power_data[1:], 'b')
+
+    def plot_spectrogram(self, freq_data, time_data, power_data) -> None:
+        """
+        Plots the spectrogram (in dB) on the spectrogram pane.
+        """
+
+        self.__spectrogram_ax.clear()
+        self.__spectrogram_ax.set_xlabel("Time (s)")
+        self.__spectrogram_ax.set_ylabel("Frequency (Hz)")
+
+        if len(time_data) > 0 and len(freq_data) > 0:
+            # Limit the colour range so near silent bins don't wash out the rest of the plot
+            power_db = 10 * np.log10(power_data + np.finfo(float).tiny)
+            # The bins are (near) evenly spaced, so an image matches a mesh and is faster to draw
+            time_step = time_data[1] - time_data[0] if len(time_data) > 1 else 1.0
+            freq_step = freq_data[1] - freq_data[0] if len(freq_data) > 1 else 1.0
+            extent = (time_data[0] - time_step / 2, time_data[-1] + time_step / 2,
+                      freq_data[0] - freq_step / 2, freq_data[-1] + freq_step / 2)
+            self.__spectrogram_ax.imshow(power_db, origin='lower', aspect='auto', extent=extent,
+                                         interpolation='nearest', vmin=power_db.max() - 80,
+                                         vmax=power_db.max())
+
+    def show_rolling_error(self, message: str) -> None:
+        """
+        Shows why the rolling statistics couldn't be calculated on the rolling pane.
+        """
+
+        self.__show_message(self.__rolling_ax, "Rolling statistics unavailable:\n" + message)
+
+    def show_spectral_error(self, message: str) -> None:
+        """
+        Shows why the spectrum couldn't be calculated on the spectrum and spectrogram panes.
+        """
+
+        self.__show_message(self.__spectrum_ax, "Spectrum unavailable:\n" + message)
+        self.__show_message(self.__spectrogram_ax, "Spectrogram unavailable:\n" + message)
+
+    @staticmethod
+    def __show_message(axis: plt.Axes, message: str) -> None:
+        """
+        Clears a pane and writes a message in the middle of it.
+        """
+
+        axis.clear()
+        axis.set_xticks([])
+        axis.set_yticks([])
+        axis.text(0.5, 0.5, message, ha='center', va='center', wrap=True,
+                  transform=axis.transAxes)
@@ -0,0 +1,3 @@
+"""
+Here to please pylint
+"""
@@ -0,0 +1,388 @@
+"""
+This module contains the tests for the signal analysis module.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from pc_grapher import analysis, data_components
+
+
+def reference_segment_psd(values: np.ndarray, sample_rate: float,
+                          segment_length: int) -> np.ndarray:
+    """
+    Calculates the one sided PSD of every half overlapping segment, one segment at a time.
+
+    :param values: The sample values.
+    :param sample_rate: The sample rate in Hz.
+    :param segment_length: The number of samples in each segment (must be even).
+    :return: An array with one row of power spectral density per segment.
+    """
+
+    window = np.hanning(segment_length + 2)[1:-1]
+    psds = []
+    for start in range(0, len(values) - segment_length + 1, segment_length // 2):
+        segment = values[start:start + segment_length]
+        power = np.abs(np.fft.rfft((segment - segment.mean()) * window)) ** 2
+        psd = power / (sample_rate * np.sum(window * window))
+        psd[1:-1] *= 2
+        psds.append(psd)
+
+    return np.array(psds)
+
+
+class StubGraphData:
+    """
+    A stand in for GraphData which holds its values in memory instead of reading a file.
+    """
+
+    def __init__(self, values, sample_interval: float = 0.02, file_name: str = 'stub.txt',
+                 modified_time: float = 0.0) -> None:
+        """
+        The constructor stores the data the stub returns.
+
+        :param values: The sample values.
+        :param sample_interval: The time between samples in seconds.
+        :param file_name: The name of the file the data pretends to be from.
+        :param modified_time: The modified time of the file the data pretends to be from.
+        :return: None
+        """
+
+        self.__values = np.asarray(values, dtype=np.float64)
+        self.__sample_interval = sample_interval
+        self.__file_name = file_name
+        self.__modified_time = modified_time
+
+    def get_value_array(self) -> np.ndarray:
+        """
+        Returns the value data.
+        """
+
+        return self.__values
+
+    def get_sample_interval(self) -> float:
+        """
+        Returns the time between samples in seconds.
+        """
+
+        return self.__sample_interval
+
+    def get_file_name(self) -> str:
+        """
+        Returns the name of the file.
+        """
+
+        return self.__file_name
+
+    def get_modified_time(self) -> float:
+        """
+        Returns the modified time of the file.
+        """
+
+        return self.__modified_time
+
+
+class TestRolling(unittest.TestCase):
+    """
+    Tests the rolling statistics against a sliding window reference.
+    """
+
+    def setUp(self) -> None:
+        """
+        Creates some random data to test with.
+        """
+
+        self.values = np.random.default_rng(0).normal(100, 20, size=1003)
+
+    def test_matches_sliding_window(self) -> None:
+        """
+        Tests the rolling mean, RMS and max match a sliding window for several window sizes.
+        """
+
+        for window in (1, 2, 7, 64, 1003):
+            with self.subTest(window=window):
+                windows = sliding_window_view(self.values, window)
+                np.testing.assert_allclose(analysis.rolling_mean(self.values, window),
+                                           windows.mean(axis=1))
+                np.testing.assert_allclose(analysis.rolling_rms(self.values, window),
+                                           np.sqrt((windows ** 2).mean(axis=1)))
+                np.testing.assert_array_equal(analysis.rolling_max(self.values, window),
+                                              windows.max(axis=1))
+
+    def test_window_too_long(self) -> None:
+        """
+        Tests a window longer than the data gives no values, and an empty window is rejected.
+        """
+
+        self.assertEqual(len(analysis.rolling_max(self.values, 2000)), 0)
+        self.assertEqual(len(analysis.rolling_mean(self.values, 2000)), 0)
+        with self.assertRaises(ValueError):
+            analysis.rolling_mean(self.values, 0)
+
+
+class TestDecimate(unittest.TestCase):
+    """
+    Tests the min/max decimation of the raw data plot.
+    """
+
+    def setUp(self) -> None:
+        """
+        Creates some random data to test with.
+        """
+
+        self.values = np.random.default_rng(0).normal(100, 20, size=1003)
+
+    def test_decimate_keeps_extremes(self) -> None:
+        """
+        Tests the min/max decimation keeps the extreme values in time order.
+        """
+
+        indices, values = analysis.decimate_min_max(self.values, 100)
+
+        self.assertLessEqual(len(indices), 100)
+        self.assertTrue(np.all(np.diff(indices) >= 0))
+        self.assertEqual(values.max(), self.values.max())
+        self.assertEqual(values.min(), self.values.min())
+        np.testing.assert_array_equal(values, self.values[indices])
+
+
+class TestRollingAnalysis(unittest.TestCase):
+    """
+    Tests the rolling statistics drawn by the app, reduced to display points.
+    """
+
+    sample_interval: float = 0.02
+
+    def setUp(self) -> None:
+        """
+        Creates some random data with a single spike to test with.
+        """
+
+        self.values = np.random.default_rng(3).normal(100, 5, size=1000)
+        self.values[537] = 1000.0
+
+    def test_reduced_to_display_points(self) -> None:
+        """
+        Tests the statistics are reduced to the display points while keeping the spike and
+        aligning each point to the end of its first window.
+        """
+
+        window: int = 10  # 0.2s at 50Hz, so there are 991 windows
+        rolling = analysis.RollingAnalysis(StubGraphData(self.values, self.sample_interval),
+                                           window_time=0.2, display_points=50)
+        time_data, mean_data, rms_data, max_data = rolling.get_rolling()
+
+        self.assertLessEqual(len(time_data), 50)
+        for data in (mean_data, rms_data, max_data):
+            self.assertEqual(len(data), len(time_data))
+        self.assertAlmostEqual(time_data[0], (window - 1) * self.sample_interval)
+        self.assertEqual(max_data.max(), 1000.0)
+
+        # The first point summarises the first 20 windows (991 windows / 50 points rounded up)
+        self.assertAlmostEqual(mean_data[0], analysis.rolling_mean(self.values, window)[:20].mean())
+        self.assertAlmostEqual(rms_data[0], analysis.rolling_rms(self.values, window)[:20].mean())
+        self.assertEqual(max_data[0], analysis.rolling_max(self.values, window)[:20].max())
+
+    def test_window_clamped_to_data(self) -> None:
+        """
+        Tests a window longer than the data is shortened to a single window over all of it.
+        """
+
+        rolling = analysis.RollingAnalysis(StubGraphData(self.values, self.sample_interval),
+                                           window_time=60.0)
+        time_data, mean_data, _, max_data = rolling.get_rolling()
+
+        np.testing.assert_allclose(time_data, [(len(self.values) - 1) * self.sample_interval])
+        np.testing.assert_allclose(mean_data, [self.values.mean()])
+        np.testing.assert_array_equal(max_data, [1000.0])
+
+
+class TestSampleInterval(unittest.TestCase):
+    """
+    Tests the analysis rejects data without a usable time axis.
+    """
+
+    def test_zero_interval_raises(self) -> None:
+        """
+        Tests both analyses raise for a 0ms time interval.
+        """
+
+        graph_data = StubGraphData(np.arange(100.0), sample_interval=0.0)
+        for analysis_type in (analysis.RollingAnalysis, analysis.SpectralAnalysis):
+            with self.subTest(analysis_type=analysis_type.__name__):
+                with self.assertRaises(ValueError):
+                    analysis_type(graph_data)
+
+
+class TestSpectralAnalysis(unittest.TestCase):
+    """
+    Tests the spectrum and spectrogram drawn by the app.
+    """
+
+    sample_interval: float = 0.02  # 50Hz
+
+    def test_white_noise_parseval(self) -> None:
+        """
+        Tests the area under the PSD of white noise equals its variance.
+        """
+
+        values = np.random.default_rng(1).normal(5.0, 2.0, size=200_000)
+        freqs, psd = analysis.SpectralAnalysis(StubGraphData(values)).get_spectrum()
+
+        self.assertAlmostEqual(np.sum(psd) * (freqs[1] - freqs[0]), 4.0, delta=0.1)
+
+    def test_sine_peak(self) -> None:
+        """
+        Tests a sine wave peaks at its frequency with an area of amplitude^2 / 2.
+        """
+
+        segment_length: int = 1024
+        frequency: float = 100 / (segment_length * self.sample_interval)  # exactly on bin 100
+        times = np.arange(100_000) * self.sample_interval
+        values = 50 + 3.0 * np.sin(2 * np.pi * frequency * times)
+
+        spectral = analysis.SpectralAnalysis(StubGraphData(values), segment_length)
+        freqs, psd = spectral.get_spectrum()
+
+        self.assertAlmostEqual(freqs[np.argmax(psd)], frequency)
+        self.assertAlmostEqual(np.sum(psd) * (freqs[1] - freqs[0]), 4.5, delta=0.01)
+
+    def test_column_spanning_chunks(self) -> None:
+        """
+        Tests spectrogram columns whose segments are split across transform chunks are summed
+        the same as when they are transformed one at a time.
+        """
+
+        segment_length: int = 16
+        sample_rate: float = 1 / self.sample_interval
+        values = np.random.default_rng(2).normal(size=segment_length + 20 * segment_length // 2)
+        reference = reference_segment_psd(values, sample_rate, segment_length)
+        segment_columns = np.arange(len(reference)) * 3 // len(reference)  # 7 per column
+
+        # With 4 segments per chunk every column crosses a chunk boundary
+        with mock.patch.object(analysis, 'SEGMENT_CHUNK_SIZE', 4):
+            spectral = analysis.SpectralAnalysis(StubGraphData(values), segment_length,
+                                                 spectrogram_columns=3)
+        freqs, times, columns = spectral.get_spectrogram()
+
+        self.assertEqual(columns.shape, (len(freqs), 3))
+        for column in range(3):
+            expected = reference[segment_columns == column].mean(axis=0)
+            np.testing.assert_allclose(columns[:, column], expected)
+
+        centres = (np.arange(len(reference)) * segment_length // 2 + segment_length / 2)
+        np.testing.assert_allclose(times, [centres[segment_columns == column].mean() /
+                                           sample_rate for column in range(3)])
+
+        np.testing.assert_allclose(spectral.get_spectrum()[1], reference.mean(axis=0))
+
+
+class TestAnalysisCache(unittest.TestCase):
+    """
+    Tests the analysis cache reuses, refreshes and evicts the analysis of files correctly.
+    """
+
+    def setUp(self) -> None:
+        """
+        Creates a cache which keeps two files.
+        """
+
+        self.cache = analysis.AnalysisCache(max_files=2)
+        self.values = np.random.default_rng(4).normal(100, 5, size=2000)
+
+    def tearDown(self) -> None:
+        """
+        Stops the cache's worker.
+        """
+
+        self.cache.shutdown()
+
+    def test_same_file_reused(self) -> None:
+        """
+        Tests requesting the same file name and modified time returns the same future.
+        """
+
+        future = self.cache.request_spectral(StubGraphData(self.values))
+        future.result()
+
+        self.assertIs(self.cache.request_spectral(StubGraphData(self.values)), future)
+
+    def test_new_modified_time(self) -> None:
+        """
+        Tests a file with a new modified time is analysed again.
+        """
+
+        future = self.cache.request_spectral(StubGraphData(self.values, modified_time=1.0))
+        future.result()
+        newer = self.cache.request_spectral(StubGraphData(self.values, modified_time=2.0))
+
+        self.assertIsNot(newer, future)
+        newer.result()
+
+    def test_failed_analysis_resubmitted(self) -> None:
+        """
+        Tests a failed analysis isn't reused from the cache.
+        """
+
+        graph_data = StubGraphData(self.values, sample_interval=0.0)
+        future = self.cache.request_spectral(graph_data)
+        with self.assertRaises(ValueError):
+            future.result()
+
+        retry = self.cache.request_spectral(graph_data)
+        self.assertIsNot(retry, future)
+        with self.assertRaises(ValueError):
+            retry.result()
+
+    def test_least_recently_used_evicted(self) -> None:
+        """
+        Tests a third file evicts the least recently used file when two files are kept.
+        """
+
+        futures = {}
+        for file_name in ('a.txt', 'b.txt'):
+            futures[file_name] = self.cache.request_spectral(
+                StubGraphData(self.values, file_name=file_name))
+            futures[file_name].result()
+
+        # Using a.txt again makes b.txt the least recently used, so it's the one evicted
+        self.assertIs(self.cache.request_spectral(
+            StubGraphData(self.values, file_name='a.txt')), futures['a.txt'])
+        self.cache.request_spectral(StubGraphData(self.values, file_name='c.txt')).result()
+
+        self.assertIs(self.cache.request_spectral(
+            StubGraphData(self.values, file_name='a.txt')), futures['a.txt'])
+        self.assertIsNot(self.cache.request_spectral(
+            StubGraphData(self.values, file_name='b.txt')), futures['b.txt'])
+
+
+class TestGraphDataModifiedTime(unittest.TestCase):
+    """
+    Tests GraphData records the modified time of the file it imports.
+    """
+
+    def test_modified_time_recorded(self) -> None:
+        """
+        Tests the modified time is the file's when it was imported, not when it's asked for.
+        """
+
+        with tempfile.TemporaryDirectory() as folder:
+            file_path = os.path.join(folder, 'data.txt')
+            with open(file_path, 'w', encoding='utf-8') as file:
+                file.write("Current,20\n1.0,2.0,3.0")
+            os.utime(file_path, (1000.0, 1000.0))
+
+            with mock.patch.object(data_components, 'get_appdata_file_path',
+                                   lambda name: os.path.join(folder, name)):
+                graph_data = data_components.GraphData('data.txt')
+            os.utime(file_path, (2000.0, 2000.0))
+
+            self.assertEqual(graph_data.get_modified_time(), 1000.0)
+
+
+if __name__ == '__main__':
+    unittest.main()